@@ -4,21 +4,48 @@ Author: Arjun
 Description: Backend server for AI-powered translation and summarization
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
+import os
 import time
+import msgspec
+import orjson
+from utils.runtime import configure_threads
+
+# Thread settings must be in place before the models import torch
+configure_threads()
+
 from models.translator import TranslationService
 from models.summarizer import SummarizationService
-from utils.helpers import validate_text, format_error_response
+from utils.helpers import validate_text, format_error_response, format_success_response
+from utils.json_provider import ORJSONProvider
+from utils.schemas import TranslateRequest, SummarizeRequest, decode_request
 import config
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)  # Faster JSON encoding/decoding for jsonify and get_json
 CORS(app)  # Enable CORS for frontend communication
 
 # Initialize services
 translator = TranslationService()
 summarizer = SummarizationService()
 
+# In debug mode the dev server's reloader also runs this module in a file-watcher
+# process; only the process serving requests (WERKZEUG_RUN_MAIN set) loads models
+_IS_RELOADER_WATCHER = (
+    __name__ == '__main__'
+    and config.DEBUG
+    and os.environ.get('WERKZEUG_RUN_MAIN') != 'true'
+)
+if config.WARMUP_ON_START and not _IS_RELOADER_WATCHER:
+    translator.start_warm_up()
+    summarizer.start_warm_up()
+
+# Static config responses are encoded once at startup and returned verbatim
+_LANGUAGES_JSON = orjson.dumps({'success': True, 'languages': config.SUPPORTED_LANGUAGES})
+_TRANSLATION_MODELS_JSON = orjson.dumps({'success': True, 'models': config.TRANSLATION_MODELS})
+_SUMMARIZATION_MODELS_JSON = orjson.dumps({'success': True, 'models': config.SUMMARIZATION_MODELS})
+
 
 @app.route('/', methods=['GET'])
 def home():
@@ -47,20 +74,29 @@ def translate():
         start_time = time.time()
         
         # Get request data
-        data = request.get_json()
+        body = request.get_data()
         
-        if not data:
-            return format_error_response("No data provided"), 400
+        if not body:
+            return format_error_response("No data provided")
         
-        text = data.get('text', '').strip()
-        source_lang = data.get('source', 'auto')
-        target_lang = data.get('target', 'en')
-        model_id = data.get('model', 'nllb')
+        try:
+            data = decode_request(body, TranslateRequest)
+        except msgspec.DecodeError as e:
+            return format_error_response(f"Invalid request body: {str(e)}")
+        
+        text = data.text.strip()
+        source_lang = data.source
+        target_lang = data.target
+        model_id = data.model
         
         # Validate input
         is_valid, error_msg = validate_text(text)
         if not is_valid:
-            return format_error_response(error_msg), 400
+            return format_error_response(error_msg)
+        
+        for lang_code in (source_lang, target_lang):
+            if lang_code not in config.SUPPORTED_LANGUAGES_BY_CODE:
+                return format_error_response(f"Unsupported language: {lang_code}")
         
         # Perform translation
         translated_text = translator.translate(
@@ -72,8 +108,7 @@ def translate():
         
         processing_time = round(time.time() - start_time, 2)
         
-        return jsonify({
-            'success': True,
+        return format_success_response({
             'translated_text': translated_text,
             'source_language': source_lang,
             'target_language': target_lang,
@@ -82,7 +117,7 @@ def translate():
         })
         
     except Exception as e:
-        return format_error_response(str(e)), 500
+        return format_error_response(str(e), 500)
 
 
 @app.route('/summarize', methods=['POST'])
@@ -102,20 +137,25 @@ def summarize():
         start_time = time.time()
         
         # Get request data
-        data = request.get_json()
+        body = request.get_data()
         
-        if not data:
-            return format_error_response("No data provided"), 400
+        if not body:
+            return format_error_response("No data provided")
         
-        text = data.get('text', '').strip()
-        model_id = data.get('model', 'bart')
-        length = data.get('length', 'short')
-        output_format = data.get('format', 'paragraph')
+        try:
+            data = decode_request(body, SummarizeRequest)
+        except msgspec.DecodeError as e:
+            return format_error_response(f"Invalid request body: {str(e)}")
+        
+        text = data.text.strip()
+        model_id = data.model
+        length = data.length
+        output_format = data.format
         
         # Validate input
-        is_valid, error_msg = validate_text(text, min_length=50)
+        is_valid, error_msg = validate_text(text, min_length=config.MIN_SUMMARY_LENGTH)
         if not is_valid:
-            return format_error_response(error_msg), 400
+            return format_error_response(error_msg)
         
         # Perform summarization
         summary = summarizer.summarize(
@@ -127,8 +167,7 @@ def summarize():
         
         processing_time = round(time.time() - start_time, 2)
         
-        return jsonify({
-            'success': True,
+        return format_success_response({
             'summary': summary,
             'model_used': model_id,
             'length': length,
@@ -137,61 +176,85 @@ def summarize():
         })
         
     except Exception as e:
-        return format_error_response(str(e)), 500
+        return format_error_response(str(e), 500)
+
+
+@app.route('/summarize/stream', methods=['POST'])
+def summarize_stream():
+    """
+    Stream a summary as Server-Sent Events while it is being generated
+    
+    Request Body: same as /summarize (output is always a paragraph)
+    
+    Each event is {"delta": "..."} with the next piece of the summary;
+    the stream ends with {"done": true}, or {"error": "..."} on failure
+    """
+    body = request.get_data()
+    
+    if not body:
+        return format_error_response("No data provided")
+    
+    try:
+        data = decode_request(body, SummarizeRequest)
+    except msgspec.DecodeError as e:
+        return format_error_response(f"Invalid request body: {str(e)}")
+    
+    text = data.text.strip()
+    model_id = data.model
+    length = data.length
+    
+    # Validate input
+    is_valid, error_msg = validate_text(text, min_length=config.MIN_SUMMARY_LENGTH)
+    if not is_valid:
+        return format_error_response(error_msg)
+    
+    def generate():
+        try:
+            for delta in summarizer.stream_summary(text=text, model_id=model_id, length=length):
+                yield b'data: ' + orjson.dumps({'delta': delta}) + b'\n\n'
+            yield b'data: {"done":true}\n\n'
+        except Exception as e:
+            yield b'data: ' + orjson.dumps({'error': str(e)}) + b'\n\n'
+    
+    return Response(
+        generate(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 
 @app.route('/languages', methods=['GET'])
 def get_languages():
     """Get list of supported languages"""
-    try:
-        languages = config.SUPPORTED_LANGUAGES
-        return jsonify({
-            'success': True,
-            'languages': languages
-        })
-    except Exception as e:
-        return format_error_response(str(e)), 500
+    return Response(_LANGUAGES_JSON, mimetype='application/json')
 
 
 @app.route('/models/translation', methods=['GET'])
 def get_translation_models():
     """Get list of available translation models"""
-    try:
-        models = config.TRANSLATION_MODELS
-        return jsonify({
-            'success': True,
-            'models': models
-        })
-    except Exception as e:
-        return format_error_response(str(e)), 500
+    return Response(_TRANSLATION_MODELS_JSON, mimetype='application/json')
 
 
 @app.route('/models/summarization', methods=['GET'])
 def get_summarization_models():
     """Get list of available summarization models"""
-    try:
-        models = config.SUMMARIZATION_MODELS
-        return jsonify({
-            'success': True,
-            'models': models
-        })
-    except Exception as e:
-        return format_error_response(str(e)), 500
+    return Response(_SUMMARIZATION_MODELS_JSON, mimetype='application/json')
 
 
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
-    return format_error_response("Endpoint not found"), 404
+    return format_error_response("Endpoint not found", 404)
 
 
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
-    return format_error_response("Internal server error"), 500
+    return format_error_response("Internal server error", 500)
 
 
 if __name__ == '__main__':
+    # Development server only - use gunicorn (see wsgi.py) in production
     print("=" * 60)
     print("🚀 Starting Arjun AI Text Tools Server")
     print("=" * 60)
@@ -18,6 +18,55 @@ DEBUG = True
 API_TOKEN = os.getenv('API_TOKEN', '')  # Your API token from .env file
 API_BASE_URL = "https://api-inference.huggingface.co/models/"
 
+# Local Inference Configuration
+# When transformers/torch are installed, models run in-process and the
+# Inference API is only used as a fallback
+USE_LOCAL_MODELS = os.getenv('USE_LOCAL_MODELS', 'True').lower() == 'true'
+
+# gunicorn worker processes (also used to split CPU cores between workers).
+# With local models every worker holds its own copy of the weights and competes
+# for the same cores, so one worker with more threads is the better default
+WORKER_PROCESSES = int(os.getenv('GUNICORN_WORKERS', '1' if USE_LOCAL_MODELS else '2'))
+
+# Run a dummy request for each task's recommended model at startup (in the
+# background) so the first real request doesn't pay the model load
+WARMUP_ON_START = os.getenv('WARMUP_ON_START', 'True').lower() == 'true'
+
+# Dynamic Batching Configuration
+# Concurrent requests for the same local model are grouped into one batched call
+BATCH_MAX_SIZE = int(os.getenv('BATCH_MAX_SIZE', '8'))
+BATCH_MAX_WAIT_MS = int(os.getenv('BATCH_MAX_WAIT_MS', '15'))
+
+# Long Input Configuration
+# Local models get inputs split into sentence chunks of at most CHUNK_MAX_TOKENS;
+# summaries of inputs above SUMMARY_CHUNK_THRESHOLD tokens are built chunk by chunk
+CHUNK_MAX_TOKENS = 400
+SUMMARY_CHUNK_THRESHOLD = 900
+
+# Result Cache Configuration
+# Identical requests are answered from cache; set REDIS_URL to share it across workers
+CACHE_MAX_SIZE = int(os.getenv('CACHE_MAX_SIZE', '4096'))
+CACHE_TTL = int(os.getenv('CACHE_TTL', '3600'))  # Seconds (Redis only)
+REDIS_URL = os.getenv('REDIS_URL', '')
+
+# Load PyTorch models in bfloat16 on GPUs that support it (Ampere and newer)
+USE_HALF_PRECISION = os.getenv('USE_HALF_PRECISION', 'True').lower() == 'true'
+
+# ONNX Runtime Configuration
+# Models exported by scripts/export_onnx.py are picked up from here automatically
+ONNX_MODEL_DIR = os.getenv(
+    'ONNX_MODEL_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'onnx_models')
+)
+
+# TensorRT Configuration (GPU hosts only)
+# Built engines are cached per model, precision and GPU architecture
+USE_TENSORRT = os.getenv('USE_TENSORRT', 'True').lower() == 'true'
+TRT_ENGINE_CACHE_DIR = os.getenv(
+    'TRT_ENGINE_CACHE_DIR',
+    os.path.join(ONNX_MODEL_DIR, 'trt_engines')
+)
+
 # Translation Models Configuration
 TRANSLATION_MODELS = [
     {
@@ -118,6 +167,9 @@ SUPPORTED_LANGUAGES = [
     {'code': 'id', 'name': 'Indonesian', 'native': 'Bahasa Indonesia'}
 ]
 
+# Language lookup by code, for O(1) validation
+SUPPORTED_LANGUAGES_BY_CODE = {lang['code']: lang for lang in SUPPORTED_LANGUAGES}
+
 # Text Validation Configuration
 MAX_TEXT_LENGTH = 10000  # Maximum characters for translation/summarization
 MIN_SUMMARY_LENGTH = 50  # Minimum characters required for summarization
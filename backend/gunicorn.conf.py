@@ -0,0 +1,25 @@
+"""
+Gunicorn configuration for Arjun AI Text Tools
+
+Threaded workers let several /translate and /summarize requests run at once;
+model inference releases the GIL, so threads scale until the CPU cores are busy.
+"""
+
+import os
+import config
+
+bind = f"{config.HOST}:{config.PORT}"
+
+# 'gevent' suits API-only deployments (USE_LOCAL_MODELS=False): while a worker
+# waits on the Inference API it serves other requests instead of holding a thread.
+# Keep 'gthread' with local models - inference would block gevent's event loop.
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '256'))
+
+# Each worker loads its own copy of the local models - defaults to 1 when they
+# are enabled (see config.WORKER_PROCESSES)
+workers = config.WORKER_PROCESSES
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+
+# Cold model loads and long generations can exceed the default 30s
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
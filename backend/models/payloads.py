@@ -0,0 +1,56 @@
+"""
+Inference API Payloads
+Typed request bodies for the Hugging Face Inference API, encoded with msgspec
+"""
+
+from typing import Optional
+import msgspec
+
+
+class InferenceOptions(msgspec.Struct, omit_defaults=True):
+    """Inference API options (only non-default values are sent)"""
+    wait_for_model: bool = False
+    use_cache: bool = True
+
+
+class TranslationParameters(msgspec.Struct):
+    """Language pair for NLLB translation"""
+    src_lang: str
+    tgt_lang: str
+
+
+class TranslationPayload(msgspec.Struct, omit_defaults=True):
+    """Request body for a translation model"""
+    inputs: str
+    parameters: Optional[TranslationParameters] = None
+    options: Optional[InferenceOptions] = None
+
+
+class SummarizationParameters(msgspec.Struct):
+    """Generation parameters for a summarization model"""
+    max_length: int
+    min_length: int
+    do_sample: bool = False
+
+
+class SummarizationPayload(msgspec.Struct, omit_defaults=True):
+    """Request body for a summarization model"""
+    inputs: str
+    parameters: SummarizationParameters
+    options: Optional[InferenceOptions] = None
+
+
+_encoder = msgspec.json.Encoder()
+
+
+def encode_payload(payload):
+    """
+    Encode a payload struct to JSON bytes
+
+    Args:
+        payload: TranslationPayload or SummarizationPayload
+
+    Returns:
+        JSON-encoded request body
+    """
+    return _encoder.encode(payload)
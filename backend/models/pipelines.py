@@ -0,0 +1,299 @@
+"""
+Local Pipeline Module
+Loads Hugging Face models in-process so requests skip the Inference API round-trip
+"""
+
+import os
+import threading
+import config
+from utils.runtime import inference_thread_count
+
+try:
+    import torch
+    from transformers import AutoConfig, AutoTokenizer, AutoModelForSeq2SeqLM, TextIteratorStreamer, pipeline
+    LOCAL_INFERENCE_AVAILABLE = True
+except ImportError:
+    LOCAL_INFERENCE_AVAILABLE = False
+
+if LOCAL_INFERENCE_AVAILABLE:
+    # This worker's share of the physical cores; requests already run in parallel
+    # across gunicorn threads, so inter-op parallelism only adds contention
+    torch.set_num_threads(inference_thread_count())
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Can only be set once, before any inter-op work has started
+        pass
+
+try:
+    import onnxruntime as ort
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    ONNX_RUNTIME_AVAILABLE = True
+except ImportError:
+    ONNX_RUNTIME_AVAILABLE = False
+
+# File names written by ORTQuantizer for the three seq2seq sub-graphs
+QUANTIZED_FILE_NAMES = {
+    'encoder_file_name': 'encoder_model_quantized.onnx',
+    'decoder_file_name': 'decoder_model_quantized.onnx',
+    'decoder_with_past_file_name': 'decoder_with_past_model_quantized.onnx'
+}
+
+
+def get_onnx_dir(model_path):
+    """
+    Get the directory holding the FP32 ONNX export of a model
+
+    Args:
+        model_path: Full path to the model on the Hugging Face Hub
+
+    Returns:
+        Export directory path
+    """
+    return os.path.join(config.ONNX_MODEL_DIR, model_path.replace('/', '__'))
+
+
+def get_quantized_dir(model_path):
+    """
+    Get the directory holding the INT8 quantized ONNX export of a model
+
+    Args:
+        model_path: Full path to the model on the Hugging Face Hub
+
+    Returns:
+        Quantized export directory path
+    """
+    return os.path.join(get_onnx_dir(model_path), 'quantized')
+
+
+def _create_session_options():
+    """Create ONNX Runtime session options with full graph optimization"""
+    session_options = ort.SessionOptions()
+    session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    session_options.intra_op_num_threads = inference_thread_count()
+    session_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    return session_options
+
+
+def _tensorrt_available():
+    """Check whether models can run on the TensorRT execution provider"""
+    return (
+        config.USE_TENSORRT
+        and ONNX_RUNTIME_AVAILABLE
+        and torch.cuda.is_available()
+        and 'TensorrtExecutionProvider' in ort.get_available_providers()
+    )
+
+
+# Sequence length TensorRT engines are tuned for (most requests are a few sentences)
+TRT_OPTIMAL_SEQUENCE_LENGTH = 128
+
+
+def _get_trt_profile_shapes(model_config):
+    """
+    Build explicit TensorRT optimization profiles for the seq2seq sub-graphs
+
+    Without explicit profiles TensorRT builds each engine for the first shapes it
+    sees (e.g. the warm-up request) and rebuilds whenever a later input falls
+    outside them. Ranges cover a single token up to the model's maximum length
+    and one text up to a full batch. The same options are passed to the encoder,
+    decoder and decoder-with-past sessions, so inputs of all three are listed;
+    each session only uses the names it has.
+
+    Args:
+        model_config: Transformers config of the model
+
+    Returns:
+        Tuple of (min_shapes, opt_shapes, max_shapes) in TensorRT's
+        'name:dim1xdim2,...' format
+    """
+    max_length = getattr(model_config, 'max_position_embeddings', None) or 512
+    layers = getattr(model_config, 'decoder_layers', None) or model_config.num_decoder_layers
+    heads = getattr(model_config, 'decoder_attention_heads', None) or model_config.num_heads
+    head_dim = getattr(model_config, 'd_kv', None) or model_config.d_model // heads
+
+    def shapes(batch, length):
+        dims = {
+            'input_ids': (batch, length),
+            'attention_mask': (batch, length),
+            'encoder_attention_mask': (batch, length),
+            'encoder_hidden_states': (batch, length, model_config.d_model)
+        }
+        for layer in range(layers):
+            for source in ('decoder', 'encoder'):
+                for tensor in ('key', 'value'):
+                    dims[f"past_key_values.{layer}.{source}.{tensor}"] = (batch, heads, length, head_dim)
+        return ','.join(f"{name}:{'x'.join(map(str, shape))}" for name, shape in dims.items())
+
+    return (
+        shapes(1, 1),
+        shapes(1, TRT_OPTIMAL_SEQUENCE_LENGTH),
+        shapes(config.BATCH_MAX_SIZE, max_length)
+    )
+
+
+def _get_trt_provider_options(model_path, model_config):
+    """
+    Get TensorRT provider options for FP16 engines cached on disk
+
+    Args:
+        model_path: Full path to the model on the Hugging Face Hub
+        model_config: Transformers config of the model
+
+    Returns:
+        Provider options dictionary
+    """
+    major, minor = torch.cuda.get_device_capability()
+    cache_path = os.path.join(
+        config.TRT_ENGINE_CACHE_DIR,
+        model_path.replace('/', '__'),
+        'fp16',
+        f"sm{major}{minor}"
+    )
+    os.makedirs(cache_path, exist_ok=True)
+    min_shapes, opt_shapes, max_shapes = _get_trt_profile_shapes(model_config)
+
+    return {
+        'trt_fp16_enable': True,
+        'trt_engine_cache_enable': True,
+        'trt_engine_cache_path': cache_path,
+        'trt_profile_min_shapes': min_shapes,
+        'trt_profile_opt_shapes': opt_shapes,
+        'trt_profile_max_shapes': max_shapes
+    }
+
+
+def _get_torch_dtype():
+    """
+    Get the weight dtype for PyTorch models on this machine
+
+    bfloat16 halves memory traffic and uses tensor cores while keeping FP32's
+    exponent range. Cards older than Ampere lack bf16, and plain fp16 can
+    overflow in these models, so they stay in FP32.
+
+    Returns:
+        torch.bfloat16, or None to load the default FP32 weights
+    """
+    if not (config.USE_HALF_PRECISION and torch.cuda.is_available()):
+        return None
+
+    major, _ = torch.cuda.get_device_capability()
+    if major >= 8 and torch.cuda.is_bf16_supported():
+        return torch.bfloat16
+    return None
+
+
+def _load_model(model_path):
+    """
+    Load the fastest available variant of a seq2seq model
+
+    Prefers TensorRT FP16 engines on GPU hosts, then the quantized ONNX export
+    on CPU-only hosts, otherwise the PyTorch weights (on the GPU when present)
+
+    Args:
+        model_path: Full path to the model on the Hugging Face Hub
+
+    Returns:
+        Tuple of (model, tokenizer_path)
+    """
+    onnx_dir = get_onnx_dir(model_path)
+    quantized_dir = get_quantized_dir(model_path)
+
+    # TensorRT builds from the FP32 export - it cannot consume dynamically quantized graphs
+    if _tensorrt_available() and os.path.isfile(os.path.join(onnx_dir, 'encoder_model.onnx')):
+        # Separate decoder graphs: the merged one switches on an If node TensorRT can't profile
+        model = ORTModelForSeq2SeqLM.from_pretrained(
+            onnx_dir,
+            provider='TensorrtExecutionProvider',
+            provider_options=_get_trt_provider_options(model_path, AutoConfig.from_pretrained(onnx_dir)),
+            session_options=_create_session_options(),
+            use_merged=False
+        )
+        return model, onnx_dir
+
+    # The INT8 export runs on the CPU provider - never trade a GPU for it
+    if ONNX_RUNTIME_AVAILABLE and not torch.cuda.is_available() and os.path.isdir(quantized_dir):
+        model = ORTModelForSeq2SeqLM.from_pretrained(
+            quantized_dir,
+            provider='CPUExecutionProvider',
+            session_options=_create_session_options(),
+            **QUANTIZED_FILE_NAMES
+        )
+        return model, quantized_dir
+
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_path, torch_dtype=_get_torch_dtype())
+    return model, model_path
+
+
+def load_pipeline(task, model_path):
+    """
+    Load a model and tokenizer and wrap them in a transformers pipeline
+
+    Args:
+        task: Pipeline task ('translation' or 'summarization')
+        model_path: Full path to the model on the Hugging Face Hub
+
+    Returns:
+        Ready-to-call pipeline
+    """
+    model, tokenizer_path = _load_model(model_path)
+    tokenizer = AutoTokenizer.from_pretrained(tokenizer_path)
+
+    # The quantized export always runs on the CPU provider
+    if tokenizer_path == get_quantized_dir(model_path):
+        device = -1
+        backend = 'ONNX Runtime INT8'
+    elif tokenizer_path == get_onnx_dir(model_path):
+        device = 0
+        backend = 'ONNX Runtime TensorRT FP16'
+    else:
+        device = 0 if torch.cuda.is_available() else -1
+        backend = f"PyTorch {str(model.dtype).replace('torch.', '')}"
+
+    print(f"📥 Loaded local model: {model_path} ({backend}, device: {'cuda' if device == 0 else 'cpu'})")
+    return pipeline(task, model=model, tokenizer=tokenizer, device=device)
+
+
+def stream_generate(text_pipeline, text, **generate_kwargs):
+    """
+    Generate text with a pipeline's model, yielding decoded pieces as they are produced
+
+    Generation runs on a background thread; this generator reads from a
+    TextIteratorStreamer so callers can forward tokens before decoding finishes.
+    Decoding is always greedy (num_beams=1) because transformers refuses to
+    stream beam search, which most of the configured models default to.
+
+    Args:
+        text_pipeline: Pipeline returned by load_pipeline()
+        text: Input text
+        generate_kwargs: Extra arguments for model.generate (max_length, ...)
+
+    Yields:
+        Decoded text pieces, in order
+    """
+    tokenizer = text_pipeline.tokenizer
+    model = text_pipeline.model
+
+    # Pipelines add task prefixes (e.g. T5's "summarize: ") - generate() doesn't
+    prefix = getattr(model.config, 'prefix', None) or ''
+    inputs = tokenizer(prefix + text, return_tensors='pt', truncation=True).to(text_pipeline.device)
+
+    streamer = TextIteratorStreamer(tokenizer, skip_special_tokens=True, timeout=config.REQUEST_TIMEOUT)
+    errors = []
+
+    def generate():
+        try:
+            model.generate(**inputs, streamer=streamer, num_beams=1, **generate_kwargs)
+        except Exception as e:
+            # Hand the failure to the consumer instead of leaving it waiting for the timeout
+            errors.append(e)
+            streamer.end()
+
+    threading.Thread(target=generate, daemon=True).start()
+
+    for piece in streamer:
+        if piece:
+            yield piece
+
+    if errors:
+        raise errors[0]
@@ -3,8 +3,32 @@ Summarization Service Module
 Handles all text summarization operations using AI models
 """
 
+import re
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import orjson
 import requests
 import config
+from models.pipelines import LOCAL_INFERENCE_AVAILABLE, load_pipeline, stream_generate
+from models.payloads import (
+    InferenceOptions,
+    SummarizationParameters,
+    SummarizationPayload,
+    encode_payload
+)
+from utils.batcher import DynamicBatcher, gather_results
+from utils.cache import ResultCache
+from utils.helpers import create_api_session, is_error_message, extract_text, chunk_by_tokens
+
+# Sentence terminators (runs like "?!" count as one) plus following whitespace
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+\s*')
+
+# Floor for per-chunk summary length when a very long input is condensed
+_MIN_CHUNK_SUMMARY_TOKENS = 16
+
+# Room left in the model's input window for special tokens and task prefixes (T5's "summarize: ")
+_INPUT_TOKEN_MARGIN = 16
 
 
 class SummarizationService:
@@ -15,6 +39,57 @@ class SummarizationService:
         self.api_token = config.API_TOKEN
         self.api_base_url = config.API_BASE_URL
         self.models = {model['id']: model for model in config.SUMMARIZATION_MODELS}
+        # Persistent connection pool for Inference API calls
+        self._session = create_api_session(self._prepare_headers())
+        # In-process pipelines, loaded on first use and keyed by model ID
+        self._local_pipelines = {}
+        self._pipeline_lock = threading.Lock()
+        self._batcher = DynamicBatcher(
+            self._run_summary_batch,
+            max_batch=config.BATCH_MAX_SIZE,
+            max_wait_ms=config.BATCH_MAX_WAIT_MS
+        )
+        self._cache = ResultCache(
+            'summarize',
+            maxsize=config.CACHE_MAX_SIZE,
+            ttl=config.CACHE_TTL,
+            redis_url=config.REDIS_URL
+        )
+        # Streaming decodes greedily, so its output never shares entries with summarize()'s beam search
+        self._stream_cache = ResultCache(
+            'summarize-stream',
+            maxsize=config.CACHE_MAX_SIZE,
+            ttl=config.CACHE_TTL,
+            redis_url=config.REDIS_URL
+        )
+    
+    def start_warm_up(self):
+        """Load the recommended model in the background so the first request doesn't wait for it"""
+        threading.Thread(target=self._warm_up, name='summarizer-warmup', daemon=True).start()
+    
+    def _warm_up(self):
+        """Run one dummy summary so the recommended model is loaded before real traffic"""
+        model_id = next((m['id'] for m in config.SUMMARIZATION_MODELS if m['recommended']), 'bart')
+        text = "The quick brown fox jumps over the lazy dog near the river bank."
+        length_params = self._get_length_params('short')
+        
+        if self._get_local_pipeline(model_id) is not None:
+            result = self._summarize_locally(text, model_id, length_params)
+        else:
+            payload = SummarizationPayload(
+                inputs=text,
+                parameters=SummarizationParameters(
+                    max_length=length_params['max_length'],
+                    min_length=length_params['min_length']
+                ),
+                options=InferenceOptions(wait_for_model=True)
+            )
+            result = self._make_api_request(self._get_model_path(model_id), payload)
+        
+        if is_error_message(result):
+            print(f"⚠️  Summarization warm-up failed: {result}")
+        else:
+            print(f"🔥 Summarization model '{model_id}' warmed up")
         
     def _get_model_path(self, model_id):
         """Get the full model path for a given model ID"""
@@ -22,6 +97,33 @@ class SummarizationService:
             model_id = 'bart'  # Default to BART
         return self.models[model_id]['model_path']
     
+    def _get_local_pipeline(self, model_id):
+        """
+        Get the in-process pipeline for a model, loading it on first use
+        
+        Args:
+            model_id: Model identifier
+            
+        Returns:
+            Summarization pipeline, or None if local inference is unavailable
+        """
+        if not (config.USE_LOCAL_MODELS and LOCAL_INFERENCE_AVAILABLE):
+            return None
+        
+        if model_id not in self._local_pipelines:
+            with self._pipeline_lock:
+                if model_id not in self._local_pipelines:
+                    try:
+                        self._local_pipelines[model_id] = load_pipeline(
+                            'summarization', self._get_model_path(model_id)
+                        )
+                    except Exception as e:
+                        # Remember the failure so we don't retry the load on every request
+                        print(f"❌ Failed to load local model '{model_id}': {str(e)}")
+                        self._local_pipelines[model_id] = None
+        
+        return self._local_pipelines[model_id]
+    
     def _prepare_headers(self):
         """Prepare API request headers"""
         return {
@@ -53,13 +155,11 @@ class SummarizationService:
         Returns:
             Bullet-pointed text
         """
-        # Split by sentences
-        sentences = text.replace('!', '.').replace('?', '.').split('.')
-        sentences = [s.strip() for s in sentences if s.strip()]
+        # Split by sentences in a single regex pass
+        sentences = (s.strip() for s in _SENTENCE_SPLIT_RE.split(text))
         
         # Format as bullets
-        bullets = '\n'.join([f"• {sentence}" for sentence in sentences])
-        return bullets
+        return '\n'.join(f"• {sentence}" for sentence in sentences if sentence)
     
     def _make_api_request(self, model_path, payload):
         """
@@ -73,32 +173,16 @@ class SummarizationService:
             Summarized text or error message
         """
         url = f"{self.api_base_url}{model_path}"
-        headers = self._prepare_headers()
         
         try:
-            response = requests.post(
+            response = self._session.post(
                 url,
-                headers=headers,
-                json=payload,
+                data=encode_payload(payload),
                 timeout=config.REQUEST_TIMEOUT
             )
             
             if response.status_code == 200:
-                result = response.json()
-                
-                # Handle different response formats
-                if isinstance(result, list) and len(result) > 0:
-                    if 'summary_text' in result[0]:
-                        return result[0]['summary_text']
-                    elif 'generated_text' in result[0]:
-                        return result[0]['generated_text']
-                elif isinstance(result, dict):
-                    if 'summary_text' in result:
-                        return result['summary_text']
-                    elif 'generated_text' in result:
-                        return result['generated_text']
-                
-                return str(result)
+                return extract_text(orjson.loads(response.content))
             
             elif response.status_code == 503:
                 return "⏳ Model is loading, please wait a moment and try again..."
@@ -112,6 +196,91 @@ class SummarizationService:
         except Exception as e:
             return f"Error: {str(e)}"
     
+    def _summarize_locally(self, text, model_id, length_params):
+        """
+        Summarize text using the in-process pipeline
+        
+        The text is queued on the batcher so concurrent requests for the same
+        model and length share one forward pass. Inputs longer than the model
+        handles well are summarized chunk by chunk, then the joined chunk
+        summaries are summarized again to the requested length.
+        
+        Args:
+            text: Text to summarize
+            model_id: Model identifier to use
+            length_params: Dictionary with max_length and min_length
+            
+        Returns:
+            Summarized text or error message
+        """
+        key = (model_id, length_params['max_length'], length_params['min_length'])
+        # Chunk summaries and the final pass share one timeout
+        deadline = time.monotonic() + config.REQUEST_TIMEOUT
+        
+        try:
+            text = self._condense_long_text(text, key, deadline)
+            return gather_results([self._batcher.submit(key, text)], deadline)[0]
+        except FutureTimeoutError:
+            return "Error: Request timed out. Please try again."
+        except Exception as e:
+            return f"Error: {str(e)}"
+    
+    def _condense_long_text(self, text, key, deadline):
+        """
+        Shrink a text too long for one pass into its joined chunk summaries
+        
+        The user's length settings only apply to the final pass. The input budget
+        is SUMMARY_CHUNK_THRESHOLD or the model's own input limit, whichever is
+        smaller; chunk summaries are sized so their joined text fits that budget
+        and the final pass does not have to truncate it.
+        
+        Args:
+            text: Text to summarize
+            key: Batcher key tuple of (model_id, max_length, min_length)
+            deadline: time.monotonic() value by which the chunk summaries are needed
+            
+        Returns:
+            The text itself if it fits the model, otherwise the chunk summaries
+        """
+        model_id = key[0]
+        tokenizer = self._local_pipelines[model_id].tokenizer
+        input_budget = min(config.SUMMARY_CHUNK_THRESHOLD, tokenizer.model_max_length - _INPUT_TOKEN_MARGIN)
+        if len(tokenizer(text).input_ids) <= input_budget:
+            return text
+        
+        chunks = chunk_by_tokens(text, tokenizer, max_tokens=min(config.CHUNK_MAX_TOKENS, input_budget))
+        chunk_max_length = max(
+            _MIN_CHUNK_SUMMARY_TOKENS,
+            min(config.CHUNK_MAX_TOKENS // 4, input_budget // len(chunks))
+        )
+        chunk_key = (model_id, chunk_max_length, chunk_max_length // 2)
+        futures = [self._batcher.submit(chunk_key, chunk) for chunk in chunks]
+        return ' '.join(gather_results(futures, deadline))
+    
+    def _run_summary_batch(self, key, texts):
+        """
+        Summarize a batch of texts that share a model and length
+        
+        Args:
+            key: Tuple of (model_id, max_length, min_length)
+            texts: List of texts to summarize
+            
+        Returns:
+            List of summaries, in input order
+        """
+        model_id, max_length, min_length = key
+        summarizer = self._local_pipelines[model_id]
+        
+        results = summarizer(
+            texts,
+            batch_size=len(texts),
+            max_length=max_length,
+            min_length=min_length,
+            do_sample=False,
+            truncation=True
+        )
+        return [result['summary_text'] for result in results]
+    
     def summarize(self, text, model_id='bart', length='short', output_format='paragraph'):
         """
         Summarize text using AI models
@@ -125,31 +294,109 @@ class SummarizationService:
         Returns:
             Summarized text
         """
-        # Get model path
-        model_path = self._get_model_path(model_id)
+        if model_id not in self.models:
+            model_id = 'bart'  # Default to BART
+        
+        # Key on the settings actually used, so unknown values share the default's entry
+        if length not in config.SUMMARY_LENGTH:
+            length = 'short'
+        if output_format != 'bullets':
+            output_format = 'paragraph'
+        
+        cache_key = ResultCache.make_key(model_id, length, output_format, text)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         # Get length parameters
         length_params = self._get_length_params(length)
         
-        # Prepare payload
-        payload = {
-            "inputs": text,
-            "parameters": {
-                "max_length": length_params['max_length'],
-                "min_length": length_params['min_length'],
-                "do_sample": False
-            }
-        }
+        if self._get_local_pipeline(model_id) is not None:
+            summary = self._summarize_locally(text, model_id, length_params)
+        else:
+            # Get model path
+            model_path = self._get_model_path(model_id)
+            
+            # Prepare payload
+            payload = SummarizationPayload(
+                inputs=text,
+                parameters=SummarizationParameters(
+                    max_length=length_params['max_length'],
+                    min_length=length_params['min_length']
+                )
+            )
+            
+            # Make API request
+            summary = self._make_api_request(model_path, payload)
         
-        # Make API request
-        summary = self._make_api_request(model_path, payload)
+        # Never cache errors or "model loading" messages
+        if is_error_message(summary):
+            return summary
         
         # Format output if needed
-        if output_format == 'bullets' and not summary.startswith('Error'):
+        if output_format == 'bullets':
             summary = self._format_as_bullets(summary)
         
+        self._cache.set(cache_key, summary)
         return summary
     
+    def stream_summary(self, text, model_id='bart', length='short'):
+        """
+        Summarize text, yielding the summary in pieces as it is generated
+        
+        Only local models can stream; with the Inference API the whole summary
+        is yielded at once. Unlike summarize(), failures are raised (as
+        RuntimeError for API error/status messages) so the stream can end
+        with an error event.
+        
+        Args:
+            text: Text to summarize
+            model_id: Model identifier to use
+            length: 'short', 'medium', or 'long'
+            
+        Yields:
+            Pieces of the summary, in order
+        """
+        if model_id not in self.models:
+            model_id = 'bart'  # Default to BART
+        
+        if length not in config.SUMMARY_LENGTH:
+            length = 'short'
+        
+        cache_key = ResultCache.make_key(model_id, length, text)
+        cached = self._stream_cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        summarizer = self._get_local_pipeline(model_id)
+        if summarizer is None:
+            summary = self.summarize(text, model_id, length)
+            if is_error_message(summary):
+                raise RuntimeError(summary)
+            yield summary
+            return
+        
+        length_params = self._get_length_params(length)
+        key = (model_id, length_params['max_length'], length_params['min_length'])
+        try:
+            text = self._condense_long_text(text, key, time.monotonic() + config.REQUEST_TIMEOUT)
+        except FutureTimeoutError:
+            raise RuntimeError("Error: Request timed out. Please try again.")
+        
+        pieces = []
+        for piece in stream_generate(
+            summarizer,
+            text,
+            max_length=length_params['max_length'],
+            min_length=length_params['min_length'],
+            do_sample=False
+        ):
+            pieces.append(piece)
+            yield piece
+        
+        self._stream_cache.set(cache_key, ''.join(pieces).strip())
+    
     def get_summary_stats(self, original_text, summary):
         """
         Get statistics about the summarization
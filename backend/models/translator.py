@@ -3,9 +3,59 @@ Translation Service Module
 Handles all translation operations using AI models
 """
 
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import orjson
 import requests
 from huggingface_hub import InferenceClient
 import config
+from models.pipelines import LOCAL_INFERENCE_AVAILABLE, load_pipeline
+from models.payloads import (
+    InferenceOptions,
+    TranslationParameters,
+    TranslationPayload,
+    encode_payload
+)
+from utils.batcher import DynamicBatcher, gather_results
+from utils.cache import ResultCache
+from utils.helpers import create_api_session, is_error_message, extract_text, chunk_by_tokens
+
+# NLLB uses format like 'eng_Latn', 'hin_Deva', etc.
+_NLLB_LANG_CODES = {
+    'en': 'eng_Latn',
+    'hi': 'hin_Deva',
+    'bn': 'ben_Beng',
+    'te': 'tel_Telu',
+    'mr': 'mar_Deva',
+    'ta': 'tam_Taml',
+    'gu': 'guj_Gujr',
+    'ur': 'urd_Arab',
+    'kn': 'kan_Knda',
+    'ml': 'mal_Mlym',
+    'pa': 'pan_Guru',
+    'or': 'ory_Orya',
+    'as': 'asm_Beng',
+    'es': 'spa_Latn',
+    'fr': 'fra_Latn',
+    'de': 'deu_Latn',
+    'zh': 'zho_Hans',
+    'ar': 'arb_Arab',
+    'ja': 'jpn_Jpan',
+    'ko': 'kor_Hang',
+    'pt': 'por_Latn',
+    'ru': 'rus_Cyrl',
+    'it': 'ita_Latn',
+    'nl': 'nld_Latn',
+    'tr': 'tur_Latn',
+    'pl': 'pol_Latn',
+    'vi': 'vie_Latn',
+    'th': 'tha_Thai',
+    'id': 'ind_Latn'
+}
+
+# Output token budget per input chunk token (tokenized Indic output often runs longer)
+_OUTPUT_LENGTH_FACTOR = 2
 
 
 class TranslationService:
@@ -18,6 +68,41 @@ class TranslationService:
         self.models = {model['id']: model for model in config.TRANSLATION_MODELS}
         # Use the serverless inference endpoint
         self.client = InferenceClient(token=self.api_token, base_url="https://api-inference.huggingface.co/models")
+        # Persistent connection pool for Inference API calls
+        self._session = create_api_session(self._prepare_headers())
+        # In-process pipelines, loaded on first use and keyed by model ID
+        self._local_pipelines = {}
+        self._pipeline_lock = threading.Lock()
+        self._batcher = DynamicBatcher(
+            self._run_translation_batch,
+            max_batch=config.BATCH_MAX_SIZE,
+            max_wait_ms=config.BATCH_MAX_WAIT_MS
+        )
+        self._cache = ResultCache(
+            'translate',
+            maxsize=config.CACHE_MAX_SIZE,
+            ttl=config.CACHE_TTL,
+            redis_url=config.REDIS_URL
+        )
+    
+    def start_warm_up(self):
+        """Load the recommended model in the background so the first request doesn't wait for it"""
+        threading.Thread(target=self._warm_up, name='translator-warmup', daemon=True).start()
+    
+    def _warm_up(self):
+        """Run one dummy translation so the recommended model is loaded before real traffic"""
+        model_id = next((m['id'] for m in config.TRANSLATION_MODELS if m['recommended']), 'nllb')
+        
+        if self._get_local_pipeline(model_id) is not None:
+            result = self._translate_locally("hello", "en", "hi", model_id)
+        else:
+            # The API payload sets wait_for_model, so this blocks until the remote model is up
+            result = self._translate_via_api("hello", "en", "hi", model_id)
+        
+        if is_error_message(result):
+            print(f"⚠️  Translation warm-up failed: {result}")
+        else:
+            print(f"🔥 Translation model '{model_id}' warmed up")
         
     def _get_model_path(self, model_id):
         """Get the full model path for a given model ID"""
@@ -25,6 +110,33 @@ class TranslationService:
             model_id = 'nllb'  # Default to NLLB
         return self.models[model_id]['model_path']
     
+    def _get_local_pipeline(self, model_id):
+        """
+        Get the in-process pipeline for a model, loading it on first use
+        
+        Args:
+            model_id: Model identifier
+            
+        Returns:
+            Translation pipeline, or None if local inference is unavailable
+        """
+        if not (config.USE_LOCAL_MODELS and LOCAL_INFERENCE_AVAILABLE):
+            return None
+        
+        if model_id not in self._local_pipelines:
+            with self._pipeline_lock:
+                if model_id not in self._local_pipelines:
+                    try:
+                        self._local_pipelines[model_id] = load_pipeline(
+                            'translation', self._get_model_path(model_id)
+                        )
+                    except Exception as e:
+                        # Remember the failure so we don't retry the load on every request
+                        print(f"❌ Failed to load local model '{model_id}': {str(e)}")
+                        self._local_pipelines[model_id] = None
+        
+        return self._local_pipelines[model_id]
+    
     def _prepare_headers(self):
         """Prepare API request headers"""
         return {
@@ -44,38 +156,24 @@ class TranslationService:
             Translated text or error message
         """
         url = f"{self.api_base_url}{model_path}"
-        headers = self._prepare_headers()
         
         try:
             print(f"🔄 Requesting translation from: {url}")
             print(f"📦 Payload: {payload}")
             
-            response = requests.post(
+            response = self._session.post(
                 url,
-                headers=headers,
-                json=payload,
+                data=encode_payload(payload),
                 timeout=config.REQUEST_TIMEOUT
             )
             
             print(f"📡 Response status: {response.status_code}")
             
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 print(f"✅ Response data: {result}")
                 
-                # Handle different response formats
-                if isinstance(result, list) and len(result) > 0:
-                    if 'translation_text' in result[0]:
-                        return result[0]['translation_text']
-                    elif 'generated_text' in result[0]:
-                        return result[0]['generated_text']
-                elif isinstance(result, dict):
-                    if 'translation_text' in result:
-                        return result['translation_text']
-                    elif 'generated_text' in result:
-                        return result['generated_text']
-                
-                return str(result)
+                return extract_text(result)
             
             elif response.status_code == 503:
                 return "⏳ Model is loading, please wait a moment and try again..."
@@ -117,7 +215,115 @@ class TranslationService:
     
     def translate(self, text, source_lang, target_lang, model_id='nllb'):
         """
-        Translate text from source language to target language using post request directly
+        Translate text from source language to target language
+        
+        Uses the in-process pipeline when available, falling back to the
+        Inference API otherwise
+        
+        Args:
+            text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            model_id: Model identifier to use
+            
+        Returns:
+            Translated text
+        """
+        if model_id not in self.models:
+            model_id = 'nllb'  # Default to NLLB
+        
+        cache_key = ResultCache.make_key(model_id, source_lang, target_lang, text)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        if self._get_local_pipeline(model_id) is not None:
+            translated_text = self._translate_locally(text, source_lang, target_lang, model_id)
+        else:
+            translated_text = self._translate_via_api(text, source_lang, target_lang, model_id)
+        
+        # Never cache errors or "model loading" messages
+        if not is_error_message(translated_text):
+            self._cache.set(cache_key, translated_text)
+        
+        return translated_text
+    
+    def _translate_locally(self, text, source_lang, target_lang, model_id):
+        """
+        Translate text using the in-process pipeline
+        
+        The text is split into sentence chunks and queued on the batcher, so
+        chunks and concurrent requests for the same model and language pair
+        share one forward pass
+        
+        Args:
+            text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            model_id: Model identifier to use
+            
+        Returns:
+            Translated text
+        """
+        # Only NLLB needs the language pair; other models batch across all pairs
+        if model_id == 'nllb':
+            key = (
+                model_id,
+                self._convert_lang_code(source_lang, 'nllb'),
+                self._convert_lang_code(target_lang, 'nllb')
+            )
+            print(f"🌐 Source: {key[1]} → Target: {key[2]}")
+        else:
+            key = (model_id, None, None)
+        
+        try:
+            # Long texts are translated sentence-chunk by chunk in one batch
+            tokenizer = self._local_pipelines[model_id].tokenizer
+            chunks = chunk_by_tokens(text, tokenizer, max_tokens=config.CHUNK_MAX_TOKENS)
+            futures = [self._batcher.submit(key, chunk) for chunk in chunks]
+            return ' '.join(gather_results(futures, time.monotonic() + config.REQUEST_TIMEOUT))
+        except FutureTimeoutError:
+            return "Error: Request timed out. Please try again."
+        except Exception as e:
+            print(f"❌ Local translation error: {str(e)}")
+            return f"Error: Translation failed - {str(e)}"
+    
+    def _run_translation_batch(self, key, texts):
+        """
+        Translate a batch of texts that share a model and language pair
+        
+        Args:
+            key: Tuple of (model_id, src_lang_code, tgt_lang_code)
+            texts: List of texts to translate
+            
+        Returns:
+            List of translated texts, in input order
+        """
+        model_id, src_lang_code, tgt_lang_code = key
+        translator = self._local_pipelines[model_id]
+        
+        params = {}
+        if src_lang_code is not None:
+            # The pipeline sets tokenizer.src_lang and forced_bos_token_id from these
+            params['src_lang'] = src_lang_code
+            params['tgt_lang'] = tgt_lang_code
+        
+        # NLLB/mBART stop generating at 200 tokens by default, which cuts off full
+        # chunks; translations can also run longer than their source text
+        max_length = min(_OUTPUT_LENGTH_FACTOR * config.CHUNK_MAX_TOKENS, translator.tokenizer.model_max_length)
+        
+        results = translator(
+            texts,
+            batch_size=len(texts),
+            truncation=True,
+            max_length=max_length,
+            **params
+        )
+        return [result['translation_text'] for result in results]
+    
+    def _translate_via_api(self, text, source_lang, target_lang, model_id):
+        """
+        Translate text using a direct post request to the Inference API
         
         Args:
             text: Text to translate
@@ -139,8 +345,6 @@ class TranslationService:
             # Prepare request
             url = f"https://api-inference.huggingface.co/models/{model_path}"
             headers = {
-                "Authorization": f"Bearer {self.api_token}",
-                "Content-Type": "application/json",
                 "x-use-cache": "false"  # Bypass cache to use latest endpoint
             }
             
@@ -150,43 +354,26 @@ class TranslationService:
                 tgt_lang_code = self._convert_lang_code(target_lang, 'nllb')
                 print(f"🌐 Source: {src_lang_code} → Target: {tgt_lang_code}")
                 
-                payload = {
-                    "inputs": text,
-                    "parameters": {
-                        "src_lang": src_lang_code,
-                        "tgt_lang": tgt_lang_code
-                    },
-                    "options": {
-                        "wait_for_model": True,
-                        "use_cache": False
-                    }
-                }
+                payload = TranslationPayload(
+                    inputs=text,
+                    parameters=TranslationParameters(src_lang=src_lang_code, tgt_lang=tgt_lang_code),
+                    options=InferenceOptions(wait_for_model=True, use_cache=False)
+                )
             else:
-                payload = {
-                    "inputs": text,
-                    "options": {
-                        "wait_for_model": True
-                    }
-                }
+                payload = TranslationPayload(
+                    inputs=text,
+                    options=InferenceOptions(wait_for_model=True)
+                )
             
             print(f"📤 Sending request to: {url}")
-            response = requests.post(url, headers=headers, json=payload, timeout=60)
+            response = self._session.post(url, headers=headers, data=encode_payload(payload), timeout=60)
             print(f"📡 Response status: {response.status_code}")
             
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 print(f"✅ Response data: {result}")
                 
-                # Extract translation text
-                if isinstance(result, list) and len(result) > 0:
-                    if isinstance(result[0], dict):
-                        translated_text = result[0].get('translation_text', result[0].get('generated_text', str(result[0])))
-                    else:
-                        translated_text = str(result[0])
-                elif isinstance(result, dict):
-                    translated_text = result.get('translation_text', result.get('generated_text', str(result)))
-                else:
-                    translated_text = str(result)
+                translated_text = extract_text(result)
                 
                 print(f"✅ Translation successful: {translated_text[:100]}...")
                 return translated_text
@@ -233,39 +420,7 @@ class TranslationService:
             Model-specific language code
         """
         if model_type == 'nllb':
-            # NLLB uses format like 'eng_Latn', 'hin_Deva', etc.
-            nllb_codes = {
-                'en': 'eng_Latn',
-                'hi': 'hin_Deva',
-                'bn': 'ben_Beng',
-                'te': 'tel_Telu',
-                'mr': 'mar_Deva',
-                'ta': 'tam_Taml',
-                'gu': 'guj_Gujr',
-                'ur': 'urd_Arab',
-                'kn': 'kan_Knda',
-                'ml': 'mal_Mlym',
-                'pa': 'pan_Guru',
-                'or': 'ory_Orya',
-                'as': 'asm_Beng',
-                'es': 'spa_Latn',
-                'fr': 'fra_Latn',
-                'de': 'deu_Latn',
-                'zh': 'zho_Hans',
-                'ar': 'arb_Arab',
-                'ja': 'jpn_Jpan',
-                'ko': 'kor_Hang',
-                'pt': 'por_Latn',
-                'ru': 'rus_Cyrl',
-                'it': 'ita_Latn',
-                'nl': 'nld_Latn',
-                'tr': 'tur_Latn',
-                'pl': 'pol_Latn',
-                'vi': 'vie_Latn',
-                'th': 'tha_Thai',
-                'id': 'ind_Latn'
-            }
-            return nllb_codes.get(lang_code, 'eng_Latn')
+            return _NLLB_LANG_CODES.get(lang_code, 'eng_Latn')
         
         # For other models, return as-is
         return lang_code
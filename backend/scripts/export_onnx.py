@@ -0,0 +1,71 @@
+"""
+ONNX Export Script
+Exports every configured model to ONNX and applies dynamic INT8 quantization
+
+Usage (from the backend folder):
+    python scripts/export_onnx.py
+    python scripts/export_onnx.py nllb bart    # Only the given model IDs
+"""
+
+import os
+import sys
+
+# Make the backend modules importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transformers import AutoTokenizer
+from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+import config
+from models.pipelines import get_onnx_dir, get_quantized_dir
+
+
+def export_model(model_path):
+    """
+    Export a model to ONNX and quantize each sub-graph to INT8
+
+    Args:
+        model_path: Full path to the model on the Hugging Face Hub
+    """
+    export_dir = get_onnx_dir(model_path)
+    quantized_dir = get_quantized_dir(model_path)
+
+    print(f"🔄 Exporting {model_path} → {export_dir}")
+    model = ORTModelForSeq2SeqLM.from_pretrained(model_path, export=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    model.save_pretrained(export_dir)
+    tokenizer.save_pretrained(export_dir)
+
+    # Dynamic quantization: weights are stored as INT8, activations quantized at runtime
+    quantization_config = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+
+    for file_name in sorted(os.listdir(export_dir)):
+        if not file_name.endswith('.onnx'):
+            continue
+        print(f"⚙️  Quantizing {file_name}")
+        quantizer = ORTQuantizer.from_pretrained(export_dir, file_name=file_name)
+        quantizer.quantize(save_dir=quantized_dir, quantization_config=quantization_config)
+
+    model.config.save_pretrained(quantized_dir)
+    tokenizer.save_pretrained(quantized_dir)
+    print(f"✅ Saved quantized model to {quantized_dir}")
+
+
+def main(model_ids):
+    """Export all configured models, or only the given model IDs"""
+    model_paths = []
+    for model in config.TRANSLATION_MODELS + config.SUMMARIZATION_MODELS:
+        if model_ids and model['id'] not in model_ids:
+            continue
+        if model['model_path'] not in model_paths:
+            model_paths.append(model['model_path'])
+
+    for model_path in model_paths:
+        try:
+            export_model(model_path)
+        except Exception as e:
+            print(f"❌ Failed to export {model_path}: {str(e)}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,108 @@
+"""
+Tests for dynamic request batching
+"""
+
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+import pytest
+
+from utils.batcher import DynamicBatcher, gather_results
+
+
+def test_results_match_submission_order():
+    batcher = DynamicBatcher(lambda key, texts: [text.upper() for text in texts])
+    futures = [batcher.submit(('model',), text) for text in ('a', 'b', 'c')]
+
+    assert [future.result(timeout=5) for future in futures] == ['A', 'B', 'C']
+
+
+def test_concurrent_submissions_share_a_batch():
+    calls = []
+    batcher = DynamicBatcher(
+        lambda key, texts: calls.append(list(texts)) or texts,
+        max_batch=8,
+        max_wait_ms=200
+    )
+    futures = [batcher.submit(('model',), str(i)) for i in range(4)]
+
+    assert [future.result(timeout=5) for future in futures] == ['0', '1', '2', '3']
+    assert calls == [['0', '1', '2', '3']]
+
+
+def test_batch_is_grouped_by_full_key():
+    calls = []
+    batcher = DynamicBatcher(
+        lambda key, texts: calls.append((key, list(texts))) or texts,
+        max_wait_ms=200
+    )
+    futures = [
+        batcher.submit(('nllb', 'en', 'hi'), 'one'),
+        batcher.submit(('nllb', 'en', 'ta'), 'two'),
+        batcher.submit(('nllb', 'en', 'hi'), 'three')
+    ]
+
+    assert [future.result(timeout=5) for future in futures] == ['one', 'two', 'three']
+    assert sorted(calls) == [
+        (('nllb', 'en', 'hi'), ['one', 'three']),
+        (('nllb', 'en', 'ta'), ['two'])
+    ]
+
+
+def test_max_batch_size_is_respected():
+    sizes = []
+    batcher = DynamicBatcher(
+        lambda key, texts: sizes.append(len(texts)) or texts,
+        max_batch=2,
+        max_wait_ms=200
+    )
+    futures = [batcher.submit(('model',), str(i)) for i in range(5)]
+    for future in futures:
+        future.result(timeout=5)
+
+    assert max(sizes) <= 2
+    assert sum(sizes) == 5
+
+
+def test_handler_errors_reach_every_caller():
+    def fail(key, texts):
+        raise RuntimeError('model crashed')
+
+    batcher = DynamicBatcher(fail, max_wait_ms=50)
+    futures = [batcher.submit(('model',), text) for text in ('a', 'b')]
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match='model crashed'):
+            future.result(timeout=5)
+
+
+def test_worker_survives_a_failed_batch():
+    def run(key, texts):
+        if texts == ['bad']:
+            raise ValueError('bad input')
+        return texts
+
+    batcher = DynamicBatcher(run, max_wait_ms=1)
+    with pytest.raises(ValueError):
+        batcher.submit(('model',), 'bad').result(timeout=5)
+
+    assert batcher.submit(('model',), 'good').result(timeout=5) == 'good'
+
+def test_gather_results_shares_one_deadline():
+    futures = [Future() for _ in range(5)]
+    threading.Timer(0.05, futures[0].set_result, ('first',)).start()
+
+    started = time.monotonic()
+    with pytest.raises(FutureTimeoutError):
+        gather_results(futures, time.monotonic() + 0.3)
+
+    # Five separate 0.3s timeouts would take 1.5s
+    assert time.monotonic() - started < 1
+
+
+def test_gather_results_returns_finished_results_after_deadline():
+    future = Future()
+    future.set_result('done')
+
+    assert gather_results([future], time.monotonic() - 1) == ['done']
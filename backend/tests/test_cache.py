@@ -0,0 +1,40 @@
+"""
+Tests for the result cache
+"""
+
+from utils.cache import ResultCache
+
+
+def test_make_key_is_stable():
+    assert ResultCache.make_key('bart', 'short', 'paragraph', 'text') == \
+        ResultCache.make_key('bart', 'short', 'paragraph', 'text')
+
+
+def test_make_key_separates_parts_containing_separators():
+    # Joining on '|' made both of these "bart|short|bullets|yyy|paragraph"
+    first = ResultCache.make_key('bart', 'short', 'paragraph', 'bullets|yyy')
+    second = ResultCache.make_key('bart', 'short', 'paragraph|bullets', 'yyy')
+    assert first != second
+
+
+def test_make_key_distinguishes_types():
+    assert ResultCache.make_key('nllb', 1) != ResultCache.make_key('nllb', '1')
+
+
+def test_get_returns_stored_value():
+    cache = ResultCache('test', maxsize=2)
+    key = ResultCache.make_key('nllb', 'en', 'hi', 'hello')
+
+    assert cache.get(key) is None
+    cache.set(key, 'नमस्ते')
+    assert cache.get(key) == 'नमस्ते'
+
+
+def test_lru_evicts_oldest_entry():
+    cache = ResultCache('test', maxsize=2)
+    keys = [ResultCache.make_key(i) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.set(key, str(i))
+
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[2]) == '2'
@@ -0,0 +1,52 @@
+"""
+Tests for splitting long inputs into model-sized chunks
+"""
+
+from utils.helpers import chunk_by_tokens
+
+
+class WhitespaceTokenizer:
+    """Stand-in tokenizer where every whitespace-separated word is one token"""
+
+    def __call__(self, texts, add_special_tokens=True):
+        class Encoding:
+            input_ids = [text.split() for text in texts]
+        return Encoding()
+
+    def decode(self, ids, skip_special_tokens=True):
+        return ' '.join(ids)
+
+
+def test_short_text_is_one_chunk():
+    assert chunk_by_tokens('One two. Three four.', WhitespaceTokenizer(), max_tokens=10) == [
+        'One two. Three four.'
+    ]
+
+
+def test_sentences_are_packed_without_exceeding_the_limit():
+    text = 'a b c. d e f. g h i. j k l.'
+    chunks = chunk_by_tokens(text, WhitespaceTokenizer(), max_tokens=6)
+
+    assert chunks == ['a b c. d e f.', 'g h i. j k l.']
+
+
+def test_sentences_are_never_split_across_chunks():
+    text = 'a b c d. e f. g h i j.'
+    chunks = chunk_by_tokens(text, WhitespaceTokenizer(), max_tokens=6)
+
+    assert chunks == ['a b c d. e f.', 'g h i j.']
+    assert all(len(chunk.split()) <= 6 for chunk in chunks)
+
+
+def test_oversized_sentence_is_split_on_token_boundaries():
+    text = 'Short one. ' + ' '.join(str(i) for i in range(10))
+    chunks = chunk_by_tokens(text, WhitespaceTokenizer(), max_tokens=4)
+
+    assert chunks == ['Short one.', '0 1 2 3', '4 5 6 7', '8 9']
+
+
+def test_devanagari_danda_ends_a_sentence():
+    text = 'मेरा नाम अर्जुन है। मैं पढ़ता हूँ।'
+    chunks = chunk_by_tokens(text, WhitespaceTokenizer(), max_tokens=4)
+
+    assert chunks == ['मेरा नाम अर्जुन है।', 'मैं पढ़ता हूँ।']
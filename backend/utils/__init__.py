@@ -4,20 +4,47 @@ Utils package initialization
 
 from .helpers import (
     validate_text,
+    validate_texts,
+    create_api_session,
+    is_error_message,
+    extract_text,
     format_error_response,
     format_success_response,
     count_words,
     count_characters,
     truncate_text,
-    clean_text
+    truncate_text_bytes,
+    clean_text,
+    chunk_by_tokens
 )
+from .batcher import DynamicBatcher, gather_results
+from .cache import ResultCache
+from .json_provider import ORJSONProvider
+from .runtime import physical_core_count, inference_thread_count, configure_threads
+from .schemas import TranslateRequest, SummarizeRequest, decode_request
 
 __all__ = [
     'validate_text',
+    'validate_texts',
+    'create_api_session',
+    'is_error_message',
+    'extract_text',
     'format_error_response',
     'format_success_response',
     'count_words',
     'count_characters',
     'truncate_text',
-    'clean_text'
+    'truncate_text_bytes',
+    'clean_text',
+    'chunk_by_tokens',
+    'DynamicBatcher',
+    'gather_results',
+    'ResultCache',
+    'ORJSONProvider',
+    'physical_core_count',
+    'inference_thread_count',
+    'configure_threads',
+    'TranslateRequest',
+    'SummarizeRequest',
+    'decode_request'
 ]
@@ -0,0 +1,122 @@
+"""
+Dynamic request batching
+Groups concurrent inference requests into a single batched model call
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class DynamicBatcher:
+    """
+    Collects texts submitted from many request threads and runs them in batches
+
+    Each submission carries a key tuple whose first element is the model ID.
+    One daemon worker thread runs per model, so a model is never called from two
+    batches at once. Within a batch, texts are grouped by the full key (e.g.
+    model + language pair) and each group is passed to the handler in one call.
+    """
+
+    def __init__(self, run_batch, max_batch=8, max_wait_ms=15):
+        """
+        Initialize the batcher
+
+        Args:
+            run_batch: Callable (key, texts) returning one output per text, in order
+            max_batch: Maximum number of texts per batch
+            max_wait_ms: How long to wait for more requests before running a batch
+        """
+        self.run_batch = run_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queues = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, text):
+        """
+        Queue a text for batched processing
+
+        Args:
+            key: Tuple identifying compatible requests, starting with the model ID
+            text: Input text
+
+        Returns:
+            Future resolving to the output for this text
+        """
+        future = Future()
+        self._get_queue(key[0]).put((key, text, future))
+        return future
+
+    def _get_queue(self, model_id):
+        """Get the queue for a model, starting its worker thread on first use"""
+        if model_id not in self._queues:
+            with self._lock:
+                if model_id not in self._queues:
+                    work_queue = queue.Queue()
+                    worker = threading.Thread(
+                        target=self._worker,
+                        args=(work_queue,),
+                        name=f"batcher-{model_id}",
+                        daemon=True
+                    )
+                    worker.start()
+                    self._queues[model_id] = work_queue
+        return self._queues[model_id]
+
+    def _collect_batch(self, work_queue):
+        """Block for one item, then gather more until the batch is full or the wait expires"""
+        batch = [work_queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(work_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _worker(self, work_queue):
+        """Run batches for one model forever"""
+        while True:
+            batch = self._collect_batch(work_queue)
+
+            # Group compatible requests, preserving arrival order within each group
+            groups = {}
+            for key, text, future in batch:
+                groups.setdefault(key, []).append((text, future))
+
+            for key, items in groups.items():
+                futures = [future for _, future in items]
+                try:
+                    outputs = self.run_batch(key, [text for text, _ in items])
+                    for future, output in zip(futures, outputs):
+                        future.set_result(output)
+                except Exception as e:
+                    for future in futures:
+                        future.set_exception(e)
+
+
+def gather_results(futures, deadline):
+    """
+    Wait for futures in order under one shared deadline
+
+    Each future gets only the time left until the deadline, so a request split
+    into many chunks cannot wait longer in total than a single one.
+
+    Args:
+        futures: Futures returned by DynamicBatcher.submit()
+        deadline: time.monotonic() value by which all results are needed
+
+    Returns:
+        List of results, in the same order as the futures
+
+    Raises:
+        concurrent.futures.TimeoutError: If the deadline passes first
+    """
+    return [future.result(timeout=max(0, deadline - time.monotonic())) for future in futures]
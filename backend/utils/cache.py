@@ -0,0 +1,104 @@
+"""
+Result caching
+Stores finished translations and summaries so identical requests skip inference
+"""
+
+import hashlib
+import threading
+import orjson
+from cachetools import LRUCache
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache for model outputs, optionally backed by Redis
+
+    The in-process LRU is per worker; set a Redis URL to share results across
+    gunicorn workers and hosts.
+    """
+
+    def __init__(self, namespace, maxsize=4096, ttl=3600, redis_url=None):
+        """
+        Initialize the cache
+
+        Args:
+            namespace: Prefix separating this cache's Redis keys from others
+            maxsize: Maximum number of entries kept in the in-process LRU
+            ttl: Expiry in seconds for Redis entries
+            redis_url: Redis connection URL (in-process LRU is used when empty)
+        """
+        self.namespace = namespace
+        self.ttl = ttl
+        self._lru = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._redis = None
+
+        if redis_url:
+            if redis is None:
+                print("⚠️  REDIS_URL is set but the redis package is not installed - using in-process cache")
+            else:
+                self._redis = redis.Redis.from_url(redis_url)
+
+    @staticmethod
+    def make_key(*parts):
+        """
+        Build a compact cache key from request parameters
+
+        Parts are encoded as a JSON array, so a separator inside one value can
+        never make two different requests produce the same key.
+
+        Args:
+            parts: Values identifying the request (model, languages, text, ...)
+
+        Returns:
+            SHA-1 digest bytes
+        """
+        return hashlib.sha1(orjson.dumps(parts)).digest()
+
+    def get(self, key):
+        """
+        Look up a cached result
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Cached text, or None on a miss
+        """
+        if self._redis is not None:
+            try:
+                value = self._redis.get(self._redis_key(key))
+                return value.decode('utf-8') if value is not None else None
+            except redis.RedisError as e:
+                print(f"⚠️  Redis cache read failed: {str(e)}")
+                return None
+
+        with self._lock:
+            return self._lru.get(key)
+
+    def set(self, key, value):
+        """
+        Store a result
+
+        Args:
+            key: Key from make_key()
+            value: Text to cache
+        """
+        if self._redis is not None:
+            try:
+                self._redis.setex(self._redis_key(key), self.ttl, value)
+            except redis.RedisError as e:
+                print(f"⚠️  Redis cache write failed: {str(e)}")
+            return
+
+        with self._lock:
+            self._lru[key] = value
+
+    def _redis_key(self, key):
+        """Get the namespaced Redis key for a digest"""
+        return f"{self.namespace}:{key.hex()}"
@@ -1,10 +1,54 @@
 """
 Helper utility functions
+
+Note for contributors: do not add @numba.jit to the string helpers here.
+Numba has very limited string support and falls back to object mode, which
+makes str operations slower, not faster. Whitespace handling uses str.split()
+on purpose - it is faster than any regex here, and RE2/Hyperscan bindings treat
+\\s as ASCII-only, so they would stop collapsing Unicode spaces (e.g. NBSP in
+text pasted from the web).
 """
 
-from flask import jsonify
+import gzip
+import re
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+from flask import Response, has_request_context, request
 import config
 
+try:
+    import zstandard
+    _ZSTD_COMPRESSOR = zstandard.ZstdCompressor(level=1)
+except ImportError:
+    _ZSTD_COMPRESSOR = None
+
+# Bound once at import instead of looking up the config attribute per call
+_MAX_TEXT_LENGTH = config.MAX_TEXT_LENGTH
+
+# validate_text results that don't depend on the call, built once and shared
+_OK = (True, None)
+_ERR_EMPTY = (False, "Text cannot be empty")
+_ERR_TOO_LONG = (False, f"Text cannot exceed {_MAX_TEXT_LENGTH} characters")
+
+# JSON response building blocks
+_JSON_MIMETYPE = 'application/json'
+_ERROR_PREFIX = b'{"success":false,"error":'
+
+# API results are per-request; tell proxies up front instead of leaving them to infer it
+_CACHE_CONTROL = 'private, max-age=0'
+
+# Success bodies above this size are compressed when the client accepts it
+_COMPRESS_MIN_BYTES = 4096
+
+# Suffix appended by truncate_text / truncate_text_bytes
+_ELLIPSIS = "..."
+_ELLIPSIS_BYTES = b"..."
+
+# Sentence boundaries, including the Devanagari danda used in Hindi/Marathi text
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?।])\s+')
+
 
 def validate_text(text, min_length=1, max_length=None):
     """
@@ -18,38 +62,200 @@ def validate_text(text, min_length=1, max_length=None):
     Returns:
         Tuple of (is_valid, error_message)
     """
-    if max_length is None:
-        max_length = config.MAX_TEXT_LENGTH
+    text_length = len(text) if text else 0
+    
+    # Check if text is empty (isspace stops at the first non-whitespace character
+    # instead of allocating a stripped copy)
+    if text_length == 0 or text.isspace():
+        return _ERR_EMPTY
     
-    # Check if text is empty
-    if not text or not text.strip():
-        return False, "Text cannot be empty"
+    # Check maximum length first so oversized input is rejected cheaply
+    if max_length is None:
+        if text_length > _MAX_TEXT_LENGTH:
+            return _ERR_TOO_LONG
+    elif text_length > max_length:
+        return False, f"Text cannot exceed {max_length} characters"
     
     # Check minimum length
-    if len(text) < min_length:
+    if text_length < min_length:
         return False, f"Text must be at least {min_length} characters long"
     
-    # Check maximum length
-    if len(text) > max_length:
-        return False, f"Text cannot exceed {max_length} characters"
+    return _OK
+
+
+def validate_texts(texts, min_length=1, max_length=None):
+    """
+    Validate a batch of input texts
+    
+    The common all-valid case is checked with C-level builtins (map, min, max,
+    any) instead of a Python loop over validate_text; items are only walked
+    one by one to report which one failed.
     
-    return True, None
+    Args:
+        texts: List of texts to validate
+        min_length: Minimum required length per text
+        max_length: Maximum allowed length per text (defaults to config.MAX_TEXT_LENGTH)
+        
+    Returns:
+        Tuple of (is_valid, error_message) for the first invalid text
+    """
+    if not texts:
+        return False, "No texts provided"
+    
+    if max_length is None:
+        max_length = _MAX_TEXT_LENGTH
+    
+    lengths = list(map(len, texts))
+    if (min(lengths) >= max(min_length, 1) and max(lengths) <= max_length
+            and not any(map(str.isspace, texts))):
+        return _OK
+    
+    for index, text in enumerate(texts):
+        is_valid, error_msg = validate_text(text, min_length, max_length)
+        if not is_valid:
+            return False, f"Item {index}: {error_msg}"
+    
+    return _OK
+
+
+def create_api_session(headers):
+    """
+    Create a pooled HTTP session for Inference API calls
+    
+    Reusing one session keeps TCP/TLS connections alive between requests
+    instead of opening a new one per call.
+    
+    Args:
+        headers: Headers sent with every request (e.g. Authorization)
+        
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    session.headers.update(headers)
+    
+    # Retry briefly while the model is loading; the final 503 is still returned to the caller.
+    # Connection errors and timeouts are not retried - a slow model would otherwise
+    # hold the request for several full timeouts.
+    retry = Retry(
+        total=3,
+        connect=0,
+        read=False,
+        other=0,
+        status=3,
+        backoff_factor=0.3,
+        status_forcelist=[503],
+        allowed_methods=frozenset(['POST']),
+        raise_on_status=False
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry))
+    return session
+
+
+def is_error_message(text):
+    """
+    Check whether a service result is an error or status message
+    
+    Args:
+        text: Text returned by a translation or summarization service
+        
+    Returns:
+        True if the text is an error/status message rather than model output
+    """
+    return text.startswith(('Error', '⏳'))
+
+
+# Output keys used by the Inference API, in order of preference
+_RESULT_KEYS = ('translation_text', 'summary_text', 'generated_text')
 
 
-def format_error_response(error_message):
+def extract_text(result):
+    """
+    Extract the output text from an Inference API response
+    
+    Handles both a single result dict and a list of result dicts
+    
+    Args:
+        result: Decoded JSON response
+        
+    Returns:
+        Output text, or the stringified result if no known key is present
+    """
+    obj = result[0] if isinstance(result, list) and result else result
+    if isinstance(obj, dict):
+        for key in _RESULT_KEYS:
+            value = obj.get(key)
+            if value is not None:
+                return value
+    return str(obj)
+
+
+def _json(payload, status=200, compress=False):
+    """
+    Build a JSON response encoded with orjson
+    
+    Args:
+        payload: JSON-serializable data
+        status: HTTP status code
+        compress: Compress large bodies with zstd or gzip if the client accepts it
+        
+    Returns:
+        Flask Response
+    """
+    body = orjson.dumps(payload)
+    headers = {'Cache-Control': _CACHE_CONTROL}
+    
+    if compress and len(body) > _COMPRESS_MIN_BYTES and has_request_context():
+        # Level 1 is fast enough that compressing costs far less than sending the bytes
+        accepted = request.accept_encodings
+        if _ZSTD_COMPRESSOR is not None and accepted['zstd']:
+            body = _ZSTD_COMPRESSOR.compress(body)
+            headers['Content-Encoding'] = 'zstd'
+        elif accepted['gzip']:
+            body = gzip.compress(body, compresslevel=1)
+            headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
+    
+    return Response(body, status=status, mimetype=_JSON_MIMETYPE, headers=headers)
+
+
+def _encode_error_body(error_message):
+    """Encode an error response body (only the message needs encoding)"""
+    return _ERROR_PREFIX + orjson.dumps(error_message) + b'}'
+
+
+# Bodies for the fixed error messages the API sends most, encoded once at import
+_CACHED_ERROR_BODIES = {
+    message: _encode_error_body(message)
+    for message in (
+        _ERR_EMPTY[1],
+        _ERR_TOO_LONG[1],
+        f"Text must be at least {config.MIN_SUMMARY_LENGTH} characters long",
+        "No data provided",
+        "Endpoint not found",
+        "Internal server error"
+    )
+}
+
+# Error responses never compress, so their extra headers are constant
+_ERROR_HEADERS = {'Cache-Control': _CACHE_CONTROL}
+
+
+def format_error_response(error_message, status=400):
     """
     Format error message as JSON response
     
     Args:
         error_message: Error message string
+        status: HTTP status code
         
     Returns:
         JSON response with error
     """
-    return jsonify({
-        'success': False,
-        'error': error_message
-    })
+    body = _CACHED_ERROR_BODIES.get(error_message)
+    if body is None:
+        body = _encode_error_body(error_message)
+    return Response(body, status=status, mimetype=_JSON_MIMETYPE, headers=_ERROR_HEADERS)
 
 
 def format_success_response(data):
@@ -62,9 +268,7 @@ def format_success_response(data):
     Returns:
         JSON response with data
     """
-    response = {'success': True}
-    response.update(data)
-    return jsonify(response)
+    return _json({'success': True, **data}, compress=True)
 
 
 def count_words(text):
@@ -106,7 +310,28 @@ def truncate_text(text, max_length=100):
     """
     if len(text) <= max_length:
         return text
-    return text[:max_length] + "..."
+    return text[:max_length] + _ELLIPSIS
+
+
+def truncate_text_bytes(data, max_length=100):
+    """
+    Truncate UTF-8 encoded text to a byte length without splitting a character
+    
+    Args:
+        data: UTF-8 encoded bytes
+        max_length: Maximum length in bytes, before the ellipsis
+        
+    Returns:
+        Truncated bytes with ellipsis if needed
+    """
+    if len(data) <= max_length:
+        return data
+    
+    # Back up over continuation bytes (10xxxxxx) to the start of the cut character
+    end = max_length
+    while end > 0 and (data[end] & 0xC0) == 0x80:
+        end -= 1
+    return data[:end] + _ELLIPSIS_BYTES
 
 
 def clean_text(text):
@@ -119,10 +344,48 @@ def clean_text(text):
     Returns:
         Cleaned text
     """
-    # Remove extra whitespace
-    text = ' '.join(text.split())
+    # Collapse whitespace runs; split() already drops leading and trailing whitespace
+    return ' '.join(text.split())
+
+
+def chunk_by_tokens(text, tokenizer, max_tokens=400):
+    """
+    Split text into chunks of whole sentences that fit the model's input size
+    
+    Sentences are packed greedily until adding the next one would exceed
+    max_tokens. A single sentence longer than max_tokens is split on token
+    boundaries.
+    
+    Args:
+        text: Text to split
+        tokenizer: Tokenizer of the model the chunks are meant for
+        max_tokens: Maximum number of tokens per chunk
+        
+    Returns:
+        List of text chunks, in order
+    """
+    sentences = _SENTENCE_END_RE.split(text)
+    token_ids = tokenizer(sentences, add_special_tokens=False).input_ids
+    
+    chunks = []
+    current = []
+    current_tokens = 0
+    
+    for sentence, ids in zip(sentences, token_ids):
+        if current and current_tokens + len(ids) > max_tokens:
+            chunks.append(' '.join(current))
+            current = []
+            current_tokens = 0
+        
+        if len(ids) > max_tokens:
+            for start in range(0, len(ids), max_tokens):
+                chunks.append(tokenizer.decode(ids[start:start + max_tokens], skip_special_tokens=True))
+            continue
+        
+        current.append(sentence)
+        current_tokens += len(ids)
     
-    # Remove leading/trailing whitespace
-    text = text.strip()
+    if current:
+        chunks.append(' '.join(current))
     
-    return text
+    return chunks
@@ -0,0 +1,29 @@
+"""
+orjson-backed JSON provider for Flask
+Used by jsonify() and request.get_json() once assigned to app.json
+"""
+
+import orjson
+from flask.json.provider import JSONProvider
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONProvider(JSONProvider):
+    """JSON provider that encodes and decodes with orjson instead of the stdlib json module"""
+
+    def dumps(self, obj, **kwargs):
+        """Serialize an object to a JSON string"""
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        """Deserialize a JSON string or bytes"""
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Build a JSON response, passing orjson's bytes straight through"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=_ORJSON_OPTIONS),
+            mimetype='application/json'
+        )
@@ -0,0 +1,57 @@
+"""
+Process runtime tuning
+Matches math-library thread pools to the machine's physical cores
+"""
+
+import os
+import config
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Services whose batcher threads run model calls at the same time (translation, summarization)
+_CONCURRENT_SERVICES = 2
+
+
+def physical_core_count():
+    """
+    Get the number of physical CPU cores
+
+    Hyperthreads share execution units, so running one inference thread per
+    logical CPU oversubscribes the cores and slows MatMul-heavy models down.
+
+    Returns:
+        Physical core count (falls back to the logical count if unknown)
+    """
+    count = psutil.cpu_count(logical=False) if psutil is not None else None
+    return count or os.cpu_count() or 1
+
+
+def inference_thread_count():
+    """
+    Get the number of intra-op threads for one inference call
+
+    The physical cores are shared by every gunicorn worker process and, within
+    a worker, by the translation and summarization batchers, which run model
+    calls at the same time. Giving each of them every core would oversubscribe
+    the CPU, so the cores are divided between them.
+
+    Returns:
+        Threads per inference call (at least 1)
+    """
+    return max(1, physical_core_count() // (config.WORKER_PROCESSES * _CONCURRENT_SERVICES))
+
+
+def configure_threads():
+    """
+    Set OpenMP/MKL thread settings for the process
+
+    Must run before torch or onnxruntime is imported, since both read these
+    variables once at load. Values already set in the environment are kept.
+    No thread affinity is set: every worker would pin itself to the same cores.
+    """
+    threads = str(inference_thread_count())
+    os.environ.setdefault('OMP_NUM_THREADS', threads)
+    os.environ.setdefault('MKL_NUM_THREADS', threads)
@@ -0,0 +1,45 @@
+"""
+Request body schemas
+Typed request bodies decoded and type-checked by msgspec in a single pass
+"""
+
+import msgspec
+
+
+class TranslateRequest(msgspec.Struct):
+    """Body of a /translate request"""
+    text: str = ''
+    source: str = 'auto'
+    target: str = 'en'
+    model: str = 'nllb'
+
+
+class SummarizeRequest(msgspec.Struct):
+    """Body of a /summarize or /summarize/stream request"""
+    text: str = ''
+    model: str = 'bart'
+    length: str = 'short'
+    format: str = 'paragraph'
+
+
+_decoders = {
+    TranslateRequest: msgspec.json.Decoder(TranslateRequest),
+    SummarizeRequest: msgspec.json.Decoder(SummarizeRequest)
+}
+
+
+def decode_request(body, request_type):
+    """
+    Decode and type-check a JSON request body
+
+    Args:
+        body: Raw request body bytes
+        request_type: TranslateRequest or SummarizeRequest
+
+    Returns:
+        Decoded request struct
+
+    Raises:
+        msgspec.DecodeError: If the body is not valid JSON or a field has the wrong type
+    """
+    return _decoders[request_type].decode(body)